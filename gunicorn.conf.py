@@ -0,0 +1,36 @@
+# 文件: gunicorn.conf.py
+# 描述: 生产环境 Gunicorn 配置, 运行 `gunicorn app:app` 时自动加载
+
+import multiprocessing
+import os
+
+# worker 数量上限: app.py 中每个 worker 的 HTTP 连接池最多 10 个连接,
+# 4 个 worker 共 40 个, 保持在 Supabase 的 60 个连接限制以内。
+# gevent worker 本身即可并发处理大量请求, 不需要按 CPU 数增加进程。
+# 另外 GET 缓存和总控面板 ETag 只在各 worker 进程内有效: 某个 worker 处理写操作后,
+# 其他 worker 最多仍会返回 15 秒的旧数据 (或按旧 ETag 返回 304); worker 越少, 这种不一致越少。
+MAX_WORKERS = 4
+
+# worker 数量, 可通过 WEB_CONCURRENCY 环境变量指定 (Render 等平台会设置该变量), 均不超过 MAX_WORKERS
+workers = min(int(os.environ.get('WEB_CONCURRENCY', multiprocessing.cpu_count() * 2 + 1)), MAX_WORKERS)
+
+# 接口以等待 Supabase 网络响应为主, 使用 gevent 协程 worker, 每个 worker 可同时处理大量连接
+worker_class = 'gevent'
+worker_connections = 1000
+keepalive = 5
+
+# 在主进程中加载一次应用, 再 fork 出各个 worker。
+# 导入 app.py 时不会发起网络请求或启动线程 (HTTP 连接池按需建立连接, 日志写入线程在各 worker 中按需启动),
+# 因此 fork 后各 worker 不会共享已打开的连接。
+preload_app = True
+
+
+def post_worker_init(worker):
+    """worker 初始化完成后, 在后台预热自己的 Supabase 连接 (连接不能在主进程中建立后再由多个 worker 共享)。
+
+    预热在后台协程中执行, 不阻塞 worker 进入主循环: 即使 Supabase 响应缓慢或无法连接,
+    worker 也能按时向主进程发送心跳, 不会因超过 Gunicorn 的 worker 超时而被反复重启。
+    """
+    import threading
+    from app import warmup
+    threading.Thread(target=warmup, daemon=True).start()
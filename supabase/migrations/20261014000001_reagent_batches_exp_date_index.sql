@@ -0,0 +1,2 @@
+-- 总控面板按有效期范围查询临期批次并按有效期排序, 该索引同时覆盖范围扫描和排序
+create index if not exists reagent_batches_exp_date_idx on reagent_batches (exp_date);
@@ -0,0 +1,34 @@
+-- 试剂批次的自然键: 属性完全一致的批次视为同一批次, 入库时合并库存。
+-- nulls not distinct: 生产日期、位置等可为空的列也参与匹配 (需要 Postgres 15+)。
+create unique index if not exists reagent_batches_natural_key
+    on reagent_batches (reagent_id, batch_no, article_no, prod_date, exp_date, tests_per_unit, location, temp)
+    nulls not distinct;
+
+-- 入库一个批次: 已存在则累加 total_tests, 否则插入新批次。
+-- 返回 true 表示合并到了已有批次, false 表示新建了批次。
+create or replace function reagent_in_batch(
+    p_reagent_id uuid,
+    p_batch_no text,
+    p_article_no text,
+    p_prod_date date,
+    p_exp_date date,
+    p_tests_per_unit int,
+    p_location text,
+    p_temp text,
+    p_total_in int
+) returns boolean
+language plpgsql
+as $$
+declare
+    v_merged boolean;
+begin
+    insert into reagent_batches (reagent_id, batch_no, article_no, prod_date, exp_date, total_tests, tests_per_unit, location, temp)
+    values (p_reagent_id, p_batch_no, p_article_no, p_prod_date, p_exp_date, p_total_in, p_tests_per_unit, p_location, p_temp)
+    on conflict (reagent_id, batch_no, article_no, prod_date, exp_date, tests_per_unit, location, temp)
+    do update set total_tests = reagent_batches.total_tests + excluded.total_tests
+    -- 被更新的行 xmax 非零, 新插入的行为零
+    returning (xmax <> 0) into v_merged;
+
+    return v_merged;
+end;
+$$;
@@ -0,0 +1,51 @@
+-- 试剂主条目按名称唯一, 供入库时 on conflict (name) 合并
+create unique index if not exists reagents_name_key on reagents (name);
+
+-- 试剂入库: 创建或更新试剂主条目, 合并或新建批次, 并写入操作日志, 全部在一个事务中完成。
+-- p 为 /api/reagents/in 的请求体:
+--   { name, manufacturer, category, qty, operator,
+--     batchDetails: { batchNo, articleNo, prodDate, expDate, testsPerUnit, location, temp } }
+-- 另加 time: 应用服务器记录的操作时间, 与其他操作日志使用同一时钟 (缺省时使用数据库时间)
+create or replace function reagent_in_full(p jsonb) returns jsonb
+language plpgsql
+as $$
+declare
+    v_batch jsonb := p -> 'batchDetails';
+    v_qty int := (p ->> 'qty')::int;
+    v_tests_per_unit int := (v_batch ->> 'testsPerUnit')::int;
+    v_total_in int := v_qty * v_tests_per_unit;
+    v_reagent_id uuid;
+    v_merged boolean;
+begin
+    -- 1. 查找或创建试剂主条目, 已存在则更新制造商和分类
+    insert into reagents (name, manufacturer, category)
+    values (p ->> 'name', p ->> 'manufacturer', coalesce(p ->> 'category', '未分类'))
+    on conflict (name) do update
+        set manufacturer = excluded.manufacturer,
+            category = excluded.category
+    returning id into v_reagent_id;
+
+    -- 2. 合并或新建批次
+    v_merged := reagent_in_batch(
+        v_reagent_id,
+        v_batch ->> 'batchNo',
+        v_batch ->> 'articleNo',
+        (v_batch ->> 'prodDate')::date,
+        (v_batch ->> 'expDate')::date,
+        v_tests_per_unit,
+        v_batch ->> 'location',
+        v_batch ->> 'temp',
+        v_total_in
+    );
+
+    -- 3. 记录操作日志
+    insert into records (time, type, item_type, name, batch_or_serial, qty, operator, notes)
+    values (
+        coalesce((p ->> 'time')::timestamptz, now()),
+        '入库', '试剂', p ->> 'name', v_batch ->> 'batchNo', v_total_in, p ->> 'operator',
+        case when v_merged then '合并入库 ' else '新批次入库 ' end || v_qty || ' 盒'
+    );
+
+    return jsonb_build_object('reagentId', v_reagent_id, 'merged', v_merged, 'totalIn', v_total_in);
+end;
+$$;
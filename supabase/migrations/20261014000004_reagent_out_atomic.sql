@@ -0,0 +1,25 @@
+-- 试剂出库: 仅当库存充足时扣减, 检查与扣减在同一条 update 中完成; 库存耗尽时删除该批次。
+-- 返回扣减后的剩余数量; 批次不存在返回 null, 库存不足返回 -1。
+create or replace function reagent_out_atomic(p_id uuid, p_amt int) returns int
+language plpgsql
+as $$
+declare
+    v_new_total int;
+begin
+    update reagent_batches
+    set total_tests = total_tests - p_amt
+    where id = p_id and total_tests >= p_amt
+    returning total_tests into v_new_total;
+
+    if not found then
+        if exists (select 1 from reagent_batches where id = p_id) then
+            return -1;
+        end if;
+        return null;
+    elsif v_new_total = 0 then
+        delete from reagent_batches where id = p_id;
+    end if;
+
+    return v_new_total;
+end;
+$$;
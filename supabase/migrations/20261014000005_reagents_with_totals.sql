@@ -0,0 +1,14 @@
+-- 各试剂的汇总库存, 在数据库中完成聚合, 供 /api/reagents/summary 使用。
+-- security_invoker: 视图按调用者的权限访问底层表, 保持与直接查询表时一致的 RLS 行为。
+create or replace view reagents_with_totals
+with (security_invoker = on)
+as
+select
+    r.id,
+    r.name,
+    r.category,
+    coalesce(sum(b.total_tests), 0) as total_tests,
+    count(b.id) as batch_count
+from reagents r
+left join reagent_batches b on b.reagent_id = r.id
+group by r.id;
@@ -0,0 +1,6 @@
+-- 操作记录按 (time, id) 倒序查询 (总控面板最近记录、操作记录分页和导出), 可直接按索引顺序读取;
+-- id 用于区分时间相同的记录, 保证分页结果稳定
+create index if not exists records_time_id_desc on records (time desc, id desc);
+
+-- 设备登记时按出厂编号检查是否重复; 未填写编号的设备不参与检查
+create index if not exists equipment_serial_no on equipment (serial_no) where serial_no is not null;
@@ -0,0 +1,36 @@
+-- 数据版本号: 相关表每次写入时由触发器递增, 供总控面板生成 ETag。
+-- 版本号在写操作的同一事务中更新, 写操作提交后所有 worker 立即读到新值。
+create table if not exists data_versions (
+    name text primary key,
+    version bigint not null default 0
+);
+
+insert into data_versions (name) values ('dashboard') on conflict (name) do nothing;
+
+alter table data_versions enable row level security;
+create policy "data_versions are readable" on data_versions for select using (true);
+
+-- security definer: 触发器以表所有者身份更新版本号, 调用方无需 data_versions 的写权限
+create or replace function bump_dashboard_version() returns trigger
+language plpgsql
+security definer
+set search_path = public
+as $$
+begin
+    update data_versions set version = version + 1 where name = 'dashboard';
+    return null;
+end;
+$$;
+
+-- 总控面板依赖最近的操作记录、临期批次及其试剂名称
+create trigger records_bump_dashboard_version
+    after insert or update or delete on records
+    for each statement execute function bump_dashboard_version();
+
+create trigger reagent_batches_bump_dashboard_version
+    after insert or update or delete on reagent_batches
+    for each statement execute function bump_dashboard_version();
+
+create trigger reagents_bump_dashboard_version
+    after insert or update or delete on reagents
+    for each statement execute function bump_dashboard_version();